@@ -22,7 +22,7 @@ import sqlglot
 from sqlglot import exp
 
 
-@dataclass
+@dataclass(slots=True)
 class QueryBlock:
     """Represents a single query block (SELECT statement)."""
     qb_id: str
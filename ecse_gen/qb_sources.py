@@ -19,7 +19,7 @@ if TYPE_CHECKING:
     from ecse_gen.qb_extractor import QueryBlock
 
 
-@dataclass
+@dataclass(slots=True)
 class TableSource:
     """Represents a table source in a QB."""
     name: str  # Table name or synthetic name for derived
@@ -460,19 +460,30 @@ def extract_sources(
 def extract_sources_from_select(
     select_ast: exp.Select,
     cte_names: set[str] | None = None,
-) -> QBSources:
+    return_cte_names: bool = False,
+) -> QBSources | tuple[QBSources, set[str]]:
     """
     Extract all table sources from a SELECT AST.
 
     Args:
         select_ast: SELECT expression node
-        cte_names: Set of CTE names defined in the query
+        cte_names: Set of CTE names defined in the query. If None and
+            return_cte_names is set, they are read off the node's own
+            WITH clause in the same call.
+        return_cte_names: Also return the CTE name set, so callers that
+            need both avoid a separate get_cte_names_from_ast pass.
 
     Returns:
-        QBSources object with all table sources
+        QBSources object, or (QBSources, cte_names) when return_cte_names
+        is set
     """
+    if return_cte_names and cte_names is None:
+        cte_names = get_cte_names_from_ast(select_ast)
     extractor = SourceExtractor(cte_names=cte_names)
-    return extractor.extract(select_ast)
+    sources = extractor.extract(select_ast)
+    if return_cte_names:
+        return sources, cte_names if cte_names is not None else set()
+    return sources
 
 
 def resolve_columns(
@@ -9,14 +9,14 @@ from pathlib import Path
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class ColumnMeta:
     """Metadata for a single column."""
     name: str
     nullable: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class ForeignKey:
     """Represents a foreign key relationship (supports composite keys)."""
     from_table: str
@@ -45,7 +45,7 @@ class ForeignKey:
         return self.to_columns[0]
 
 
-@dataclass
+@dataclass(slots=True)
 class TableMeta:
     """Metadata for a single table."""
     name: str
@@ -54,7 +54,7 @@ class TableMeta:
     role: str | None = None  # "fact" or "dimension"
 
 
-@dataclass
+@dataclass(slots=True)
 class SchemaMeta:
     """
     Complete schema metadata with indexes for efficient lookups.
@@ -74,10 +74,15 @@ class SchemaMeta:
     pk_cols: dict[str, tuple[str, ...]] = field(default_factory=dict)
     fk_by_pair: dict[tuple[str, str, str, str], list[ForeignKey]] = field(default_factory=dict)
     fk_by_childcols: dict[tuple[str, tuple[str, ...], str], ForeignKey] = field(default_factory=dict)
-    # Additional index: all FKs from a child table
-    fk_by_child_table: dict[str, list[ForeignKey]] = field(default_factory=dict)
+    # Additional index: all FKs from a child table (immutable buckets)
+    fk_by_child_table: dict[str, tuple[ForeignKey, ...]] = field(default_factory=dict)
     # Column to tables index: column_name -> set of table names
     col_to_tables: dict[str, set[str]] = field(default_factory=dict)
+    # Flat (table, column) index for NOT NULL checks: one hash probe
+    not_null_pairs: frozenset[tuple[str, str]] = field(default_factory=frozenset)
+    # Membership indexes for has_table/has_column
+    table_names: frozenset[str] = field(default_factory=frozenset)
+    column_pairs: frozenset[tuple[str, str]] = field(default_factory=frozenset)
 
     def build_indexes(self) -> None:
         """Build all indexes from the loaded data."""
@@ -102,7 +107,23 @@ class SchemaMeta:
                     self.col_to_tables[col_lower] = set()
                 self.col_to_tables[col_lower].add(table_name)
 
+        # Flat NOT NULL index (not_null_set stays: callers iterate it per table)
+        self.not_null_pairs = frozenset(
+            (table_name, col)
+            for table_name, cols in self.not_null_set.items()
+            for col in cols
+        )
+
+        # Membership indexes for has_table/has_column
+        self.table_names = frozenset(self.tables)
+        self.column_pairs = frozenset(
+            (table_name, col)
+            for table_name, table_meta in self.tables.items()
+            for col in table_meta.columns
+        )
+
         # Build FK indexes
+        fks_by_child: dict[str, list[ForeignKey]] = {}
         for fk in self.foreign_keys:
             # fk_by_childcols index
             key = (fk.from_table, fk.from_columns, fk.to_table)
@@ -116,9 +137,11 @@ class SchemaMeta:
                 self.fk_by_pair[pair_key].append(fk)
 
             # fk_by_child_table index
-            if fk.from_table not in self.fk_by_child_table:
-                self.fk_by_child_table[fk.from_table] = []
-            self.fk_by_child_table[fk.from_table].append(fk)
+            fks_by_child.setdefault(fk.from_table, []).append(fk)
+
+        self.fk_by_child_table = {
+            table: tuple(fks) for table, fks in fks_by_child.items()
+        }
 
     def is_not_null(self, table: str, col: str) -> bool:
         """
@@ -131,9 +154,7 @@ class SchemaMeta:
         Returns:
             True if column is NOT NULL, False otherwise
         """
-        if table not in self.not_null_set:
-            return False
-        return col in self.not_null_set[table]
+        return (table, col) in self.not_null_pairs
 
     def find_fk_pair(
         self,
@@ -242,7 +263,7 @@ class SchemaMeta:
             return self.tables[table].role
         return None
 
-    def get_fks_from_table(self, child_table: str) -> list[ForeignKey]:
+    def get_fks_from_table(self, child_table: str) -> tuple[ForeignKey, ...]:
         """
         Get all FKs originating from a table.
 
@@ -250,19 +271,17 @@ class SchemaMeta:
             child_table: Child table name
 
         Returns:
-            List of ForeignKey objects
+            Tuple of ForeignKey objects (shared, do not mutate)
         """
-        return self.fk_by_child_table.get(child_table, [])
+        return self.fk_by_child_table.get(child_table, ())
 
     def has_table(self, table: str) -> bool:
         """Check if a table exists in the schema."""
-        return table in self.tables
+        return table in self.table_names
 
     def has_column(self, table: str, col: str) -> bool:
         """Check if a column exists in a table."""
-        if table not in self.tables:
-            return False
-        return col in self.tables[table].columns
+        return (table, col) in self.column_pairs
 
     def resolve_column(
         self,
@@ -5,7 +5,9 @@ Provides structured printing of sqlglot AST nodes,
 especially useful for debugging WITH/UNION/JOIN structures.
 """
 
-from typing import TextIO
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, TextIO
 import sys
 
 import sqlglot
@@ -171,6 +173,81 @@ def dump_sql(
     return dump_ast(ast, max_depth=max_depth, show_sql=show_sql)
 
 
+def _collect_dump_nodes(
+    node: exp.Expression,
+) -> tuple[list[exp.Join], list[exp.With]]:
+    """Collect the Join and With nodes the dumpers need in one walk."""
+    joins: list[exp.Join] = []
+    withs: list[exp.With] = []
+    for n in node.walk():
+        if isinstance(n, exp.Join):
+            joins.append(n)
+        elif isinstance(n, exp.With):
+            withs.append(n)
+    return joins, withs
+
+
+def _format_join(join: exp.Join) -> str:
+    """Format a single Join node for dump output."""
+    # Determine join type from side and kind
+    side = (join.side or "").upper()
+    kind = (join.kind or "").upper()
+
+    if side:  # LEFT, RIGHT, FULL
+        join_type = f"{side} OUTER"
+    elif kind == "CROSS":
+        join_type = "CROSS"
+    else:
+        join_type = "INNER"
+
+    # Get the joined table
+    table_expr = join.this
+    if isinstance(table_expr, exp.Table):
+        table_name = table_expr.name
+        table_alias = table_expr.alias or table_name
+    elif isinstance(table_expr, exp.Subquery):
+        table_name = "(subquery)"
+        table_alias = table_expr.alias or "(subquery)"
+    else:
+        table_name = table_expr.sql(dialect="spark")
+        table_alias = table_name
+
+    # Get ON condition
+    on_cond = join.args.get("on")
+    on_sql = on_cond.sql(dialect="spark") if on_cond else None
+
+    # Get USING columns
+    using = join.args.get("using")
+    using_cols = [col.name for col in using] if using else None
+
+    line_parts = [f"{join_type} JOIN {table_name}"]
+    if table_alias != table_name:
+        line_parts.append(f"AS {table_alias}")
+    if on_sql:
+        line_parts.append(f"ON {on_sql}")
+    if using_cols:
+        line_parts.append(f"USING ({', '.join(using_cols)})")
+
+    return ' '.join(line_parts)
+
+
+def _format_ctes(with_clause: exp.With | None) -> str:
+    """Format the CTEs of a WITH clause (the first one, as before)."""
+    if not with_clause:
+        return "No CTEs found"
+
+    lines: list[str] = []
+    for i, cte in enumerate(with_clause.expressions):
+        if isinstance(cte, exp.CTE):
+            cte_name = cte.alias
+            cte_sql = cte.this.sql(dialect="spark")
+            if len(cte_sql) > 100:
+                cte_sql = cte_sql[:97] + "..."
+            lines.append(f"CTE[{i}] {cte_name}: {cte_sql}")
+
+    return '\n'.join(lines) if lines else "No CTEs found"
+
+
 def dump_joins(node: exp.Expression) -> str:
     """
     Dump only JOIN-related nodes from AST.
@@ -183,51 +260,8 @@ def dump_joins(node: exp.Expression) -> str:
     Returns:
         String with JOIN node information
     """
-    lines: list[str] = []
-
-    for join in node.find_all(exp.Join):
-        # Determine join type from side and kind
-        side = (join.side or "").upper()
-        kind = (join.kind or "").upper()
-
-        if side:  # LEFT, RIGHT, FULL
-            join_type = f"{side} OUTER"
-        elif kind == "CROSS":
-            join_type = "CROSS"
-        else:
-            join_type = "INNER"
-
-        # Get the joined table
-        table_expr = join.this
-        if isinstance(table_expr, exp.Table):
-            table_name = table_expr.name
-            table_alias = table_expr.alias or table_name
-        elif isinstance(table_expr, exp.Subquery):
-            table_name = "(subquery)"
-            table_alias = table_expr.alias or "(subquery)"
-        else:
-            table_name = table_expr.sql(dialect="spark")
-            table_alias = table_name
-
-        # Get ON condition
-        on_cond = join.args.get("on")
-        on_sql = on_cond.sql(dialect="spark") if on_cond else None
-
-        # Get USING columns
-        using = join.args.get("using")
-        using_cols = [col.name for col in using] if using else None
-
-        line_parts = [f"{join_type} JOIN {table_name}"]
-        if table_alias != table_name:
-            line_parts.append(f"AS {table_alias}")
-        if on_sql:
-            line_parts.append(f"ON {on_sql}")
-        if using_cols:
-            line_parts.append(f"USING ({', '.join(using_cols)})")
-
-        lines.append(' '.join(line_parts))
-
-    return '\n'.join(lines)
+    joins, _ = _collect_dump_nodes(node)
+    return '\n'.join(_format_join(join) for join in joins)
 
 
 def dump_ctes(node: exp.Expression) -> str:
@@ -240,23 +274,32 @@ def dump_ctes(node: exp.Expression) -> str:
     Returns:
         String with CTE information
     """
-    lines: list[str] = []
+    _, withs = _collect_dump_nodes(node)
+    return _format_ctes(withs[0] if withs else None)
 
-    # Find WITH clause
-    with_clause = node.find(exp.With)
-    if not with_clause:
-        return "No CTEs found"
 
-    ctes = with_clause.expressions
-    for i, cte in enumerate(ctes):
-        if isinstance(cte, exp.CTE):
-            cte_name = cte.alias
-            cte_sql = cte.this.sql(dialect="spark")
-            if len(cte_sql) > 100:
-                cte_sql = cte_sql[:97] + "..."
-            lines.append(f"CTE[{i}] {cte_name}: {cte_sql}")
+def dump_all(node: exp.Expression) -> dict[str, str]:
+    """
+    Dump joins, CTEs, and unions together.
 
-    return '\n'.join(lines) if lines else "No CTEs found"
+    The join and CTE views share one tree walk; the union view still runs
+    dump_unions' structural recursion over the set-operation spine, since
+    branch numbering cannot be derived from a flat node scan. Callers that
+    need more than one view should prefer this over separate
+    dump_joins/dump_ctes calls, which each walk the AST.
+
+    Args:
+        node: sqlglot expression node
+
+    Returns:
+        Dict with "joins", "ctes", and "unions" dump strings
+    """
+    joins, withs = _collect_dump_nodes(node)
+    return {
+        "joins": '\n'.join(_format_join(join) for join in joins),
+        "ctes": _format_ctes(withs[0] if withs else None),
+        "unions": dump_unions(node),
+    }
 
 
 def dump_unions(node: exp.Expression) -> str:
@@ -297,16 +340,21 @@ def dump_unions(node: exp.Expression) -> str:
     return '\n'.join(lines) if lines else "No UNION found"
 
 
-def summarize_query(sql: str, dialect: str = "spark") -> dict:
+@lru_cache(maxsize=256)
+def summarize_query(sql: str, dialect: str = "spark") -> Mapping:
     """
     Generate a summary of query structure.
 
+    Results are memoized per (sql, dialect); the returned mapping is a
+    read-only view with tuple values so cached entries cannot be mutated
+    by callers.
+
     Args:
         sql: SQL string
         dialect: SQL dialect
 
     Returns:
-        Dict with query summary
+        Read-only mapping with query summary
     """
     ast = sqlglot.parse_one(sql, dialect=dialect)
 
@@ -325,9 +373,9 @@ def summarize_query(sql: str, dialect: str = "spark") -> dict:
     full_joins = [j for j in joins if (j.side or "").upper() == "FULL"]
     cross_joins = [j for j in joins if (j.kind or "").upper() == "CROSS"]
 
-    return {
+    return MappingProxyType({
         "table_count": len(tables),
-        "tables": [t.name for t in tables],
+        "tables": tuple(t.name for t in tables),
         "join_count": len(joins),
         "inner_joins": len(inner_joins),
         "left_joins": len(left_joins),
@@ -338,5 +386,5 @@ def summarize_query(sql: str, dialect: str = "spark") -> dict:
         "subquery_count": len(subqueries),
         "union_count": len(unions),
         "cte_count": len(ctes),
-        "cte_names": [c.alias for c in ctes],
-    }
+        "cte_names": tuple(c.alias for c in ctes),
+    })
@@ -9,6 +9,7 @@ Handles:
 - Multi-statement handling
 """
 
+import os
 import re
 from pathlib import Path
 from dataclasses import dataclass, field
@@ -41,11 +42,27 @@ def scan_workload_dir(workload_dir: Path, recursive: bool = True) -> list[Path]:
     Returns:
         List of Path objects for each .sql file, sorted by name
     """
-    if recursive:
-        sql_files = sorted(workload_dir.rglob("*.sql"))
-    else:
-        sql_files = sorted(workload_dir.glob("*.sql"))
-    return sql_files
+    # os.scandir reuses the DirEntry stat data, so this walk avoids the
+    # extra per-entry syscalls and Path churn of glob/rglob on non-.sql files.
+    sql_files: list[Path] = []
+    stack = [os.fspath(workload_dir)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            # Match glob/rglob: missing or unreadable directories are
+            # skipped silently instead of failing the whole scan.
+            continue
+        with entries:
+            # Symlinks are followed, like glob/rglob did; DirEntry still
+            # answers from the cached stat for regular entries.
+            for entry in entries:
+                if entry.is_dir():
+                    if recursive:
+                        stack.append(entry.path)
+                elif entry.name.endswith(".sql") and entry.is_file():
+                    sql_files.append(Path(entry.path))
+    return sorted(sql_files)
 
 
 def read_sql_file(sql_path: Path) -> str:
@@ -58,8 +75,55 @@ def read_sql_file(sql_path: Path) -> str:
     Returns:
         SQL content as string with BOM removed
     """
-    content = sql_path.read_text(encoding="utf-8-sig")  # utf-8-sig handles BOM
-    return content
+    # read_bytes + one decode skips the TextIOWrapper / utf-8-sig codec
+    # machinery; the BOM is just a three-byte prefix to slice off.
+    data = sql_path.read_bytes()
+    if data[:3] == b"\xef\xbb\xbf":
+        data = data[3:]
+    return data.decode("utf-8")
+
+
+# One alternation over the constructs that matter for comment stripping:
+# quoted strings/identifiers are matched (and kept) so comment markers
+# inside them are never treated as comments; '' / "" act as escapes; all
+# quoted and block-comment forms may run unterminated to end of input.
+_COMMENT_TOKENS_PATTERN = (
+    r"('(?:[^']|'')*'?)"        # single-quoted string
+    r'|("(?:[^"]|"")*"?)'       # double-quoted identifier
+    r"|(`[^`]*`?)"              # backtick identifier (Spark)
+    r"|(/\*.*?(?:\*/|\Z))"      # block comment
+    r"|(--[^\n]*)"              # line comment (trailing newline is kept)
+)
+
+
+def _compile_comment_tokens():
+    """Compile the comment pattern, optionally with RE2.
+
+    Set ECSE_USE_RE2=1 to use google-re2's linear-time engine on very
+    large workload files; anything that goes wrong (missing binary dep,
+    unsupported construct) silently falls back to the stdlib re module.
+    """
+    if os.environ.get("ECSE_USE_RE2") == "1":
+        try:
+            import re2
+
+            return re2.compile(_COMMENT_TOKENS_PATTERN, re2.DOTALL)
+        except Exception:
+            pass
+    return re.compile(_COMMENT_TOKENS_PATTERN, re.DOTALL)
+
+
+_COMMENT_TOKENS = _compile_comment_tokens()
+
+
+def _strip_comment_token(m: re.Match) -> str:
+    """Keep quoted tokens, turn block comments into a space, drop the rest."""
+    if m.group(4):
+        # Space preserves token separation around /* ... */
+        return ' '
+    if m.group(5) is not None:
+        return ''
+    return m.group(0)
 
 
 def strip_comments(sql: str) -> str:
@@ -71,83 +135,16 @@ def strip_comments(sql: str) -> str:
     - Block comments: /* ... */
     - Preserves strings (won't strip comments inside strings)
 
+    A single compiled-regex pass replaces the previous per-character
+    Python scan; the matching runs in C.
+
     Args:
         sql: SQL string
 
     Returns:
         SQL with comments removed
     """
-    result = []
-    i = 0
-    n = len(sql)
-
-    while i < n:
-        # Check for string literals (single quote)
-        if sql[i] == "'":
-            j = i + 1
-            while j < n:
-                if sql[j] == "'" and j + 1 < n and sql[j + 1] == "'":
-                    # Escaped quote
-                    j += 2
-                elif sql[j] == "'":
-                    j += 1
-                    break
-                else:
-                    j += 1
-            result.append(sql[i:j])
-            i = j
-        # Check for double-quoted identifiers
-        elif sql[i] == '"':
-            j = i + 1
-            while j < n:
-                if sql[j] == '"' and j + 1 < n and sql[j + 1] == '"':
-                    # Escaped quote
-                    j += 2
-                elif sql[j] == '"':
-                    j += 1
-                    break
-                else:
-                    j += 1
-            result.append(sql[i:j])
-            i = j
-        # Check for backtick identifiers (Spark)
-        elif sql[i] == '`':
-            j = i + 1
-            while j < n and sql[j] != '`':
-                j += 1
-            if j < n:
-                j += 1  # Include closing backtick
-            result.append(sql[i:j])
-            i = j
-        # Check for single-line comment
-        elif sql[i:i+2] == '--':
-            # Skip until end of line
-            j = i + 2
-            while j < n and sql[j] != '\n':
-                j += 1
-            # Keep the newline
-            if j < n:
-                result.append('\n')
-                j += 1
-            i = j
-        # Check for block comment
-        elif sql[i:i+2] == '/*':
-            # Skip until */
-            j = i + 2
-            while j < n - 1 and sql[j:j+2] != '*/':
-                j += 1
-            if j < n - 1:
-                j += 2  # Skip */
-            else:
-                j = n
-            # Replace with space to preserve token separation
-            result.append(' ')
-            i = j
-        else:
-            result.append(sql[i])
-            i += 1
-
-    return ''.join(result)
+    return _COMMENT_TOKENS.sub(_strip_comment_token, sql)
 
 
 def strip_trailing_semicolons(sql: str) -> str:
@@ -160,7 +157,7 @@ def strip_trailing_semicolons(sql: str) -> str:
     Returns:
         SQL with trailing semicolons removed
     """
-    return sql.rstrip().rstrip(';').rstrip()
+    return sql.rstrip(" \t\r\n;")
 
 
 def clean_sql(sql: str) -> str:
@@ -257,15 +254,20 @@ def extract_first_query(
     return first_stmt.sql(dialect=dialect), warnings
 
 
-def load_workload_query(
-    sql_path: Path,
+def load_workload_query_from_text(
+    raw_sql: str,
+    source_sql_file: str,
     dialect: str = "spark",
 ) -> WorkloadQuery:
     """
-    Load and preprocess a single SQL file.
+    Preprocess SQL text that is already in memory.
+
+    Same pipeline as load_workload_query minus the file read, so callers
+    (and unit tests) that already hold the text avoid the filesystem.
 
     Args:
-        sql_path: Path to .sql file
+        raw_sql: Raw SQL content
+        source_sql_file: Logical file name for the query (e.g., "q17.sql")
         dialect: SQL dialect
 
     Returns:
@@ -273,23 +275,12 @@ def load_workload_query(
     """
     warnings: list[str] = []
 
-    # Read raw SQL
-    try:
-        raw_sql = read_sql_file(sql_path)
-    except Exception as e:
-        return WorkloadQuery(
-            source_sql_file=sql_path.name,
-            raw_sql="",
-            cleaned_sql="",
-            warnings=[f"Failed to read file: {e}"],
-        )
-
     # Clean SQL
     cleaned_sql = clean_sql(raw_sql)
 
     if not cleaned_sql:
         return WorkloadQuery(
-            source_sql_file=sql_path.name,
+            source_sql_file=source_sql_file,
             raw_sql=raw_sql,
             cleaned_sql="",
             warnings=["Empty SQL after cleaning"],
@@ -304,13 +295,41 @@ def load_workload_query(
         extracted_sql = cleaned_sql
 
     return WorkloadQuery(
-        source_sql_file=sql_path.name,
+        source_sql_file=source_sql_file,
         raw_sql=raw_sql,
         cleaned_sql=extracted_sql,
         warnings=warnings,
     )
 
 
+def load_workload_query(
+    sql_path: Path,
+    dialect: str = "spark",
+) -> WorkloadQuery:
+    """
+    Load and preprocess a single SQL file.
+
+    Args:
+        sql_path: Path to .sql file
+        dialect: SQL dialect
+
+    Returns:
+        WorkloadQuery object
+    """
+    # Read raw SQL
+    try:
+        raw_sql = read_sql_file(sql_path)
+    except Exception as e:
+        return WorkloadQuery(
+            source_sql_file=sql_path.name,
+            raw_sql="",
+            cleaned_sql="",
+            warnings=[f"Failed to read file: {e}"],
+        )
+
+    return load_workload_query_from_text(raw_sql, sql_path.name, dialect=dialect)
+
+
 def load_workload(
     workload_dir: Path,
     dialect: str = "spark",
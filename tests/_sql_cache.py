@@ -0,0 +1,51 @@
+"""
+Session-wide caches for parsed SQL shared by the test modules.
+
+sqlglot tokenize+parse dominates the runtime of these tests, and the same
+small SQL literals are parsed many times across the suite. The helpers here
+memoize that work; callers get fresh copies wherever mutation is possible.
+"""
+
+from functools import lru_cache
+
+# sqlglot is imported lazily inside the helpers: pulling in its dialect
+# registry costs ~100ms, which collection-only runs and test files that
+# never parse (e.g. test_schema_meta.py) should not pay.
+
+
+@lru_cache(maxsize=None)
+def _resolve_dialect(dialect: str):
+    """Resolve a dialect name to its Dialect instance once."""
+    from sqlglot.dialects.dialect import Dialect
+
+    return Dialect.get_or_raise(dialect)
+
+
+@lru_cache(maxsize=256)
+def _parse(sql: str, dialect: str = "spark"):
+    """Parse SQL once per (sql, dialect) pair."""
+    import sqlglot
+
+    return sqlglot.parse_one(sql, dialect=_resolve_dialect(dialect))
+
+
+def parse(sql: str, dialect: str = "spark"):
+    """Return a copy of the cached AST for this SQL."""
+    return _parse(sql, dialect).copy()
+
+
+@lru_cache(maxsize=256)
+def _extract(sql: str, source_file: str):
+    from ecse_gen.qb_extractor import extract_query_blocks_from_sql
+
+    return extract_query_blocks_from_sql(sql, source_file)
+
+
+def extract_blocks(sql: str, source_file: str):
+    """
+    Cached extract_query_blocks_from_sql.
+
+    Returns fresh list wrappers so callers cannot mutate the cached entry.
+    """
+    qbs, warnings = _extract(sql, source_file)
+    return list(qbs), list(warnings)
@@ -0,0 +1,79 @@
+"""
+Shared pytest configuration and fixtures for the ecse_gen test suite.
+"""
+
+import os
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+from ecse_gen.schema_meta import load_schema_meta
+from tests._sql_cache import parse as _warmup_parse
+
+# Pre-warm sqlglot's lazy registries (keyword tables, expression subclass
+# maps, the Spark dialect module) so the one-time warmup cost is not billed
+# to whichever test happens to run first. The warmup AST also seeds the
+# shared parse cache. Targeted runs that never parse (e.g. only
+# test_schema_meta.py) can skip the sqlglot import entirely via the env var.
+if os.environ.get("ECSE_SKIP_SQLGLOT_WARMUP") != "1":
+    _warmup_parse(
+        "WITH w AS (SELECT 1 AS x UNION SELECT 2 AS x) "
+        "SELECT * FROM w WHERE EXISTS (SELECT 1)"
+    )
+
+
+def bucket_by_kind(qbs):
+    """Bucket QueryBlocks by qb_kind in a single pass.
+
+    Replaces repeated `[qb for qb in qbs if qb.qb_kind == ...]` scans in
+    multi-assertion tests.
+    """
+    buckets: defaultdict[str, list] = defaultdict(list)
+    for qb in qbs:
+        buckets[qb.qb_kind].append(qb)
+    return buckets
+
+# test_rollup.py is a manual script, not a test module; skip collecting it
+collect_ignore = ["test_rollup.py"]
+
+# Resolved once at import; the fixture body stays free of path arithmetic.
+_SCHEMA_META_PATH = Path(__file__).resolve().parent.parent / "schema_meta.json"
+
+
+@pytest.fixture(scope="session")
+def schema_meta():
+    """Load test schema metadata once per session (read-only)."""
+    return load_schema_meta(_SCHEMA_META_PATH)
+
+
+@pytest.fixture
+def sql_of():
+    """Memoize QueryBlock.sql() per object for the duration of a test.
+
+    QueryBlock.sql() re-serializes the AST on every call; tests that assert
+    on the generated text several times should go through this fixture.
+    """
+    cache: dict[int, str] = {}
+
+    def _get(qb) -> str:
+        key = id(qb)
+        if key not in cache:
+            cache[key] = qb.sql()
+        return cache[key]
+
+    return _get
+
+
+def pytest_configure(config):
+    """Register custom markers."""
+    config.addinivalue_line(
+        "markers",
+        "parallel: test is safe to run under pytest-xdist worker parallelism "
+        "(no shared mutable state)",
+    )
+    config.addinivalue_line(
+        "markers",
+        "benchmark: largest SQL inputs in the suite; perf CI can select "
+        "these with -m benchmark to watch for parser/extractor regressions",
+    )
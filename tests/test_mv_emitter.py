@@ -1,7 +1,16 @@
 """
 Unit tests for MV Emitter module.
+
+All tests here are independent: fixtures return read-only data
+(load_schema_meta output is never mutated), so the module is safe to run
+under pytest-xdist worker parallelism.
 """
 
+import re
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType
+
 import pytest
 from pathlib import Path
 
@@ -29,11 +38,87 @@ from ecse_gen.mv_emitter import (
 )
 
 
+pytestmark = [pytest.mark.parallel]
+
+# Schema path resolved once at import time
+_SCHEMA_PATH = Path(__file__).resolve().parent.parent / "schema_meta.json"
+
+# Pattern for checking column order in generated SQL with a single scan
+_ORDER_PAT = re.compile(
+    r"(item\.i_brand|store_sales\.ss_item_sk|store_sales\.ss_quantity)"
+)
+
+# C-level attribute access for instance_id extraction in hot assertions
+_GET_IID = attrgetter("instance_id")
+
+# Shared base_tables / alias_map value constants (read-only, built once)
+_BT_SS_ITEM = frozenset({"store_sales", "item"})
+_BT_SS = frozenset({"store_sales"})
+_ALIAS_SS_ITEM = MappingProxyType(
+    {"ss": "store_sales", "item": "item", "store_sales": "store_sales"}
+)
+_ALIAS_SS = MappingProxyType({"ss": "store_sales", "store_sales": "store_sales"})
+
+# Expected (instance_id, column) pairs for extraction tests. Tuples mirror
+# ColumnRef equality (which compares instance_id/column only) while keeping
+# the assertions free of per-check dataclass construction and hashing.
+_EXPECTED_COLS_SIMPLE = {("item", "i_item_sk"), ("item", "i_brand")}
+_EXPECTED_COLS_ALIASED = {
+    ("ss", "ss_ext_sales_price"),
+    ("ss", "ss_quantity"),
+    ("ss", "ss_item_sk"),
+}
+
+# Pre-built TableInstance frozensets shared across join-plan/remap tests.
+# Element hashes (and the lazily computed frozenset hash) are paid once
+# per test run instead of per test.
+_INSTS_SS = frozenset({TableInstance("store_sales", "store_sales")})
+_INSTS_SS_ITEM_DATE = frozenset({
+    TableInstance("store_sales", "store_sales"),
+    TableInstance("item", "item"),
+    TableInstance("date_dim", "date_dim"),
+})
+_INSTS_SS_CUSTOMER = frozenset({
+    TableInstance("store_sales", "store_sales"),
+    TableInstance("customer", "customer"),
+})
+_INSTS_SS_ITEM_PROMO = frozenset({
+    TableInstance("store_sales", "store_sales"),
+    TableInstance("item", "item"),
+    TableInstance("promotion", "promotion"),
+})
+_INSTS_ALIAS_SS = frozenset({TableInstance("ss", "store_sales")})
+_INSTS_TWO_DD = frozenset({
+    TableInstance("d1", "date_dim"),
+    TableInstance("d2", "date_dim"),
+})
+_INSTS_ALIAS_SS_I = frozenset({
+    TableInstance("ss", "store_sales"),
+    TableInstance("i", "item"),
+})
+
+# Named instance sets for the parametrized remap cases
+_INSTANCES_BANK = {
+    "ss_only": _INSTS_ALIAS_SS,
+    "two_dd": _INSTS_TWO_DD,
+}
+
+
+@lru_cache(maxsize=None)
+def _remap_context(instances_key: str) -> tuple[set[str], dict[str, list[str]]]:
+    """Build (valid_ids, base_to_insts) for a bank entry, cached per key."""
+    instances = _INSTANCES_BANK[instances_key]
+    valid_ids = {inst.instance_id.lower() for inst in instances}
+    base_to_insts: dict[str, list[str]] = {}
+    for inst in sorted(instances):
+        base_to_insts.setdefault(inst.base_table, []).append(inst.instance_id)
+    return valid_ids, base_to_insts
+
+
 @pytest.fixture
 def schema_meta():
     """Load test schema metadata."""
-    schema_path = Path(__file__).parent.parent / "schema_meta.json"
-    return load_schema_meta(schema_path)
+    return load_schema_meta(_SCHEMA_PATH)
 
 
 def make_edge(
@@ -112,14 +197,11 @@ class TestExtractColumnsFromQB:
         qbs, _ = extract_query_blocks_from_sql(sql, "test.sql", dialect="spark")
         qb = qbs[0]
 
-        base_tables = {"store_sales", "item"}
-        alias_map = {"ss": "store_sales", "item": "item", "store_sales": "store_sales"}
-
-        columns = extract_columns_from_qb(qb, base_tables, alias_map)
+        columns = extract_columns_from_qb(qb, _BT_SS_ITEM, _ALIAS_SS_ITEM)
 
         # Should extract item.i_item_sk and item.i_brand
-        assert ColumnRef(instance_id="item", column="i_item_sk") in columns
-        assert ColumnRef(instance_id="item", column="i_brand") in columns
+        actual = {(c.instance_id, c.column) for c in columns}
+        assert _EXPECTED_COLS_SIMPLE <= actual
 
     def test_extract_aliased_columns(self):
         """Test extracting columns with table aliases."""
@@ -131,15 +213,11 @@ class TestExtractColumnsFromQB:
         qbs, _ = extract_query_blocks_from_sql(sql, "test.sql", dialect="spark")
         qb = qbs[0]
 
-        base_tables = {"store_sales"}
-        alias_map = {"ss": "store_sales", "store_sales": "store_sales"}
-
-        columns = extract_columns_from_qb(qb, base_tables, alias_map)
+        columns = extract_columns_from_qb(qb, _BT_SS, _ALIAS_SS)
 
         # Should extract store_sales columns via alias - instance_id preserves alias "ss"
-        assert ColumnRef(instance_id="ss", column="ss_ext_sales_price", base_table="store_sales") in columns
-        assert ColumnRef(instance_id="ss", column="ss_quantity", base_table="store_sales") in columns
-        assert ColumnRef(instance_id="ss", column="ss_item_sk", base_table="store_sales") in columns
+        actual = {(c.instance_id, c.column) for c in columns}
+        assert _EXPECTED_COLS_ALIASED <= actual
 
     def test_exclude_nested_subquery_columns(self):
         """Test that columns from nested subqueries are excluded."""
@@ -149,17 +227,15 @@ class TestExtractColumnsFromQB:
         FROM store_sales ss
         """
         qbs, _ = extract_query_blocks_from_sql(sql, "test.sql", dialect="spark")
-        # Get the main QB (not the subquery)
-        main_qb = [qb for qb in qbs if qb.qb_kind == "main"][0]
-
-        base_tables = {"store_sales"}
-        alias_map = {"ss": "store_sales", "store_sales": "store_sales"}
+        # Get the main QB (not the subquery); next() short-circuits on first hit
+        main_qb = next(qb for qb in qbs if qb.qb_kind == "main")
 
-        columns = extract_columns_from_qb(main_qb, base_tables, alias_map)
+        columns = extract_columns_from_qb(main_qb, _BT_SS, _ALIAS_SS)
 
         # Should only extract ss.ss_item_sk from main query - instance_id preserves alias "ss"
         # i.i_price should NOT be included (it's in subquery)
-        assert ColumnRef(instance_id="ss", column="ss_item_sk", base_table="store_sales") in columns
+        actual = {(c.instance_id, c.column) for c in columns}
+        assert ("ss", "ss_item_sk") in actual
 
 
 class TestIsInNestedSelect:
@@ -255,11 +331,7 @@ class TestBuildJoinPlan:
         edge1 = make_edge("store_sales", "ss_item_sk", "item", "i_item_sk")
         edge2 = make_edge("store_sales", "ss_sold_date_sk", "date_dim", "d_date_sk")
 
-        instances = frozenset({
-            TableInstance("store_sales", "store_sales"),
-            TableInstance("item", "item"),
-            TableInstance("date_dim", "date_dim"),
-        })
+        instances = _INSTS_SS_ITEM_DATE
         edges = [edge1, edge2]
 
         ordered_instances, join_specs, warnings, is_valid = build_join_plan(instances, edges)
@@ -268,7 +340,7 @@ class TestBuildJoinPlan:
         # Then greedy: date_dim connects to store_sales, store_sales connects to item
         assert is_valid
         assert ordered_instances[0].instance_id == "date_dim"
-        instance_ids = {inst.instance_id for inst in ordered_instances}
+        instance_ids = set(map(_GET_IID, ordered_instances))
         assert instance_ids == {"date_dim", "item", "store_sales"}
         assert len(warnings) == 0
 
@@ -276,10 +348,7 @@ class TestBuildJoinPlan:
         """Test LEFT joins: preserved side comes before nullable side."""
         edge1 = make_edge("store_sales", "ss_customer_sk", "customer", "c_customer_sk", "LEFT")
 
-        instances = frozenset({
-            TableInstance("store_sales", "store_sales"),
-            TableInstance("customer", "customer"),
-        })
+        instances = _INSTS_SS_CUSTOMER
         edges = [edge1]
 
         ordered_instances, join_specs, warnings, is_valid = build_join_plan(instances, edges)
@@ -291,7 +360,7 @@ class TestBuildJoinPlan:
 
     def test_single_table_no_joins(self):
         """Test single table returns no join specs."""
-        instances = frozenset({TableInstance("store_sales", "store_sales")})
+        instances = _INSTS_SS
         edges = []
 
         ordered_instances, join_specs, warnings, is_valid = build_join_plan(instances, edges)
@@ -306,18 +375,14 @@ class TestBuildJoinPlan:
         edge1 = make_edge("store_sales", "ss_item_sk", "item", "i_item_sk", "INNER")
         edge2 = make_edge("store_sales", "ss_promo_sk", "promotion", "p_promo_sk", "LEFT")
 
-        instances = frozenset({
-            TableInstance("store_sales", "store_sales"),
-            TableInstance("item", "item"),
-            TableInstance("promotion", "promotion"),
-        })
+        instances = _INSTS_SS_ITEM_PROMO
         edges = [edge1, edge2]
 
         ordered_instances, join_specs, warnings, is_valid = build_join_plan(instances, edges)
 
         # LEFT join should enforce store_sales before promotion
         assert is_valid
-        instance_ids = [inst.instance_id for inst in ordered_instances]
+        instance_ids = list(map(_GET_IID, ordered_instances))
         ss_idx = instance_ids.index("store_sales")
         promo_idx = instance_ids.index("promotion")
         assert ss_idx < promo_idx
@@ -392,12 +457,16 @@ class TestGenerateMVSQL:
 
         # No conflict: columns should NOT have aliases (simplified strategy)
         # Columns ordered by (table, column): item.i_brand < store_sales.ss_item_sk < store_sales.ss_quantity
-        idx_item = sql.index("item.i_brand")
-        idx_ss_item = sql.index("store_sales.ss_item_sk")
-        idx_ss_qty = sql.index("store_sales.ss_quantity")
+        # Single linear scan records the first offset of each column reference
+        positions = {}
+        for m in _ORDER_PAT.finditer(sql):
+            positions.setdefault(m.group(), m.start())
 
-        assert idx_item < idx_ss_item
-        assert idx_ss_item < idx_ss_qty
+        assert (
+            positions["item.i_brand"]
+            < positions["store_sales.ss_item_sk"]
+            < positions["store_sales.ss_quantity"]
+        )
 
         # Verify no table__column aliases (no conflicts)
         assert "item__i_brand" not in sql
@@ -445,36 +514,23 @@ class TestEmitMVCandidates:
         assert "mv_001" in names
         assert "mv_002" in names
 
-    def test_mv_has_tables(self):
-        """Test MV candidates have correct tables."""
-        edge1 = make_edge("store_sales", "ss_item_sk", "item", "i_item_sk")
-        js1 = make_joinset([edge1], {"qb1"})
+    def test_single_joinset_candidate_properties(self):
+        """Test tables, qb_ids, and SQL of a single-joinset candidate.
 
-        candidates = emit_mv_candidates([js1], {})
-
-        assert len(candidates) == 1
-        assert set(candidates[0].tables) == {"store_sales", "item"}
-
-    def test_mv_has_qb_ids(self):
-        """Test MV candidates have correct qb_ids."""
+        The emit pipeline (join planning + SQL generation) is the heaviest
+        operation in this module, so run it once and assert all properties.
+        """
         edge1 = make_edge("store_sales", "ss_item_sk", "item", "i_item_sk")
         js1 = make_joinset([edge1], {"qb1", "qb2"})
 
         candidates = emit_mv_candidates([js1], {})
 
         assert len(candidates) == 1
-        assert set(candidates[0].qb_ids) == {"qb1", "qb2"}
-
-    def test_mv_sql_generated(self):
-        """Test MV candidates have valid SQL."""
-        edge1 = make_edge("store_sales", "ss_item_sk", "item", "i_item_sk")
-        js1 = make_joinset([edge1], {"qb1"})
-
-        candidates = emit_mv_candidates([js1], {})
-
-        assert len(candidates) == 1
-        assert "SELECT" in candidates[0].sql
-        assert "FROM" in candidates[0].sql
+        candidate = candidates[0]
+        assert set(candidate.tables) == {"store_sales", "item"}
+        assert set(candidate.qb_ids) == {"qb1", "qb2"}
+        assert "SELECT" in candidate.sql
+        assert "FROM" in candidate.sql
 
 
 class TestBuildAliasMapFromQB:
@@ -490,8 +546,7 @@ class TestBuildAliasMapFromQB:
         qbs, _ = extract_query_blocks_from_sql(sql, "test.sql", dialect="spark")
         qb = qbs[0]
 
-        base_tables = {"store_sales", "item"}
-        alias_map = _build_alias_map_from_qb(qb, base_tables)
+        alias_map = _build_alias_map_from_qb(qb, _BT_SS_ITEM)
 
         assert alias_map.get("ss") == "store_sales"
         assert alias_map.get("i") == "item"
@@ -500,50 +555,49 @@ class TestBuildAliasMapFromQB:
 class TestColumnRefRemap:
     """Tests for P0-4 ColumnRef instance remapping."""
 
-    def test_remap_already_valid(self):
-        """Test column with already valid instance_id is unchanged."""
-        col = ColumnRef(instance_id="ss", column="ss_item_sk", base_table="store_sales")
-        instances = frozenset({TableInstance("ss", "store_sales")})
-        valid_ids = {inst.instance_id.lower() for inst in instances}
-        base_to_insts = {"store_sales": ["ss"]}
-
-        new_col, warning = remap_column_instance_id(col, valid_ids, base_to_insts)
-
-        assert new_col is not None
-        assert new_col.instance_id == "ss"
-        assert warning is None
-
-    def test_remap_base_table_to_instance(self):
-        """Test column with instance_id==base_table remaps to actual instance."""
-        # Column uses base_table name as instance_id
-        col = ColumnRef(instance_id="store_sales", column="ss_item_sk", base_table="store_sales")
-        # But joinset uses alias 'ss'
-        instances = frozenset({TableInstance("ss", "store_sales")})
-        valid_ids = {inst.instance_id.lower() for inst in instances}
-        base_to_insts = {"store_sales": ["ss"]}
-
-        new_col, warning = remap_column_instance_id(col, valid_ids, base_to_insts)
-
-        assert new_col is not None
-        assert new_col.instance_id == "ss"  # Remapped to actual instance
-        assert warning is None
-
-    def test_remap_fails_multiple_instances(self):
-        """Test remap fails when base_table has multiple instances."""
-        col = ColumnRef(instance_id="date_dim", column="d_date_sk", base_table="date_dim")
-        # Multiple date_dim instances
-        instances = frozenset({
-            TableInstance("d1", "date_dim"),
-            TableInstance("d2", "date_dim"),
-        })
-        valid_ids = {inst.instance_id.lower() for inst in instances}
-        base_to_insts = {"date_dim": ["d1", "d2"]}
+    @pytest.mark.parametrize(
+        "col,instances_key,expected_instance_id,warn_substr",
+        [
+            # Already valid instance_id is unchanged
+            (
+                ColumnRef(instance_id="ss", column="ss_item_sk", base_table="store_sales"),
+                "ss_only",
+                "ss",
+                None,
+            ),
+            # instance_id == base_table remaps to the actual instance alias
+            (
+                ColumnRef(instance_id="store_sales", column="ss_item_sk", base_table="store_sales"),
+                "ss_only",
+                "ss",
+                None,
+            ),
+            # base_table with multiple instances cannot be safely remapped
+            (
+                ColumnRef(instance_id="date_dim", column="d_date_sk", base_table="date_dim"),
+                "two_dd",
+                None,
+                "multiple instances",
+            ),
+        ],
+        ids=["already_valid", "base_table_to_instance", "fails_multiple_instances"],
+    )
+    def test_remap_column_instance_id(
+        self, col, instances_key, expected_instance_id, warn_substr
+    ):
+        """Test remap_column_instance_id across the shared instance bank."""
+        valid_ids, base_to_insts = _remap_context(instances_key)
 
         new_col, warning = remap_column_instance_id(col, valid_ids, base_to_insts)
 
-        assert new_col is None  # Cannot safely remap
-        assert warning is not None
-        assert "multiple instances" in warning
+        if expected_instance_id is None:
+            assert new_col is None  # Cannot safely remap
+            assert warning is not None
+            assert warn_substr in warning
+        else:
+            assert new_col is not None
+            assert new_col.instance_id == expected_instance_id
+            assert warning is None
 
     def test_remap_columns_to_joinset(self):
         """Test remapping a set of columns to joinset instances."""
@@ -551,16 +605,13 @@ class TestColumnRefRemap:
             ColumnRef(instance_id="store_sales", column="ss_item_sk", base_table="store_sales"),
             ColumnRef(instance_id="item", column="i_brand", base_table="item"),
         }
-        instances = frozenset({
-            TableInstance("ss", "store_sales"),
-            TableInstance("i", "item"),
-        })
+        instances = _INSTS_ALIAS_SS_I
 
         remapped, warnings, is_valid = remap_columns_to_joinset(columns, instances)
 
         assert is_valid
         assert len(remapped) == 2
-        instance_ids = {col.instance_id for col in remapped}
+        instance_ids = set(map(_GET_IID, remapped))
         assert instance_ids == {"ss", "i"}
 
 
@@ -573,10 +624,7 @@ class TestEdgeInstanceNormalization:
         edge = make_edge("item", "i_item_sk", "store_sales", "ss_item_sk",
                          left_instance="item", right_instance="store_sales")
         # But instances use aliases
-        instances = frozenset({
-            TableInstance("i", "item"),
-            TableInstance("ss", "store_sales"),
-        })
+        instances = _INSTS_ALIAS_SS_I
 
         normalized, warnings, is_valid = _normalize_edge_instance_ids([edge], instances)
 
@@ -3,11 +3,10 @@ Unit tests for qb_sources module.
 """
 
 import pytest
-from pathlib import Path
 
-import sqlglot
 from sqlglot import exp
 
+from tests._sql_cache import parse
 from ecse_gen.qb_sources import (
     TableSource,
     QBSources,
@@ -17,14 +16,11 @@ from ecse_gen.qb_sources import (
     resolve_columns,
     get_cte_names_from_ast,
 )
-from ecse_gen.schema_meta import load_schema_meta
 
 
-@pytest.fixture
-def schema_meta():
-    """Load test schema metadata."""
-    schema_path = Path(__file__).parent.parent / "schema_meta.json"
-    return load_schema_meta(schema_path)
+_JOIN_ALIASES = frozenset({"ss", "i", "dd"})
+_JOIN_TABLES = frozenset({"store_sales", "item", "date_dim"})
+_MIXED_KINDS = frozenset({"base", "cte_ref", "derived"})
 
 
 class TestSourceExtraction:
@@ -33,7 +29,7 @@ class TestSourceExtraction:
     def test_single_table(self):
         """Test extracting single table."""
         sql = "SELECT * FROM store_sales"
-        ast = sqlglot.parse_one(sql, dialect="spark")
+        ast = parse(sql)
 
         sources = extract_sources_from_select(ast)
 
@@ -45,7 +41,7 @@ class TestSourceExtraction:
     def test_table_with_alias(self):
         """Test extracting table with alias."""
         sql = "SELECT * FROM store_sales ss"
-        ast = sqlglot.parse_one(sql, dialect="spark")
+        ast = parse(sql)
 
         sources = extract_sources_from_select(ast)
 
@@ -62,22 +58,22 @@ class TestSourceExtraction:
         JOIN item i ON ss.ss_item_sk = i.i_item_sk
         LEFT JOIN date_dim dd ON ss.ss_sold_date_sk = dd.d_date_sk
         """
-        ast = sqlglot.parse_one(sql, dialect="spark")
+        ast = parse(sql)
 
         sources = extract_sources_from_select(ast)
 
         assert len(sources.tables) == 3
 
         aliases = {t.alias for t in sources.tables}
-        assert aliases == {"ss", "i", "dd"}
+        assert aliases == _JOIN_ALIASES
 
         names = {t.name for t in sources.tables}
-        assert names == {"store_sales", "item", "date_dim"}
+        assert names == _JOIN_TABLES
 
     def test_derived_subquery(self):
         """Test extracting derived subquery."""
         sql = "SELECT * FROM (SELECT a FROM t) AS sub"
-        ast = sqlglot.parse_one(sql, dialect="spark")
+        ast = parse(sql)
 
         sources = extract_sources_from_select(ast)
 
@@ -89,7 +85,7 @@ class TestSourceExtraction:
     def test_derived_without_alias(self):
         """Test derived subquery without explicit alias."""
         sql = "SELECT * FROM (SELECT a FROM t)"
-        ast = sqlglot.parse_one(sql, dialect="spark")
+        ast = parse(sql)
 
         sources = extract_sources_from_select(ast)
 
@@ -104,13 +100,16 @@ class TestSourceExtraction:
         WITH cte1 AS (SELECT 1)
         SELECT * FROM cte1
         """
-        ast = sqlglot.parse_one(sql, dialect="spark")
-        cte_names = get_cte_names_from_ast(ast)
+        ast = parse(sql)
 
-        # Get the main SELECT (inside the WITH)
+        # Get the main SELECT (inside the WITH); CTE names come back from
+        # the same call instead of a separate get_cte_names_from_ast pass.
         main_select = ast.find(exp.Select)
-        sources = extract_sources_from_select(main_select, cte_names=cte_names)
+        sources, cte_names = extract_sources_from_select(
+            main_select, return_cte_names=True
+        )
 
+        assert cte_names == {"cte1"}
         assert len(sources.tables) == 1
         assert sources.tables[0].name == "cte1"
         assert sources.tables[0].kind == "cte_ref"
@@ -124,16 +123,18 @@ class TestSourceExtraction:
         JOIN my_cte ON ss.ss_item_sk = my_cte.x
         JOIN (SELECT * FROM item) AS derived_item ON ss.ss_item_sk = derived_item.i_item_sk
         """
-        ast = sqlglot.parse_one(sql, dialect="spark")
-        cte_names = get_cte_names_from_ast(ast)
+        ast = parse(sql)
 
         main_select = ast.find(exp.Select)
-        sources = extract_sources_from_select(main_select, cte_names=cte_names)
+        sources, cte_names = extract_sources_from_select(
+            main_select, return_cte_names=True
+        )
 
+        assert cte_names == {"my_cte"}
         assert len(sources.tables) == 3
 
         kinds = {t.kind for t in sources.tables}
-        assert kinds == {"base", "cte_ref", "derived"}
+        assert kinds == _MIXED_KINDS
 
         # Check specific sources
         by_alias = {t.alias: t for t in sources.tables}
@@ -174,7 +175,7 @@ class TestColumnResolution:
     def test_qualified_column_resolved(self):
         """Test resolving qualified column."""
         sql = "SELECT ss.ss_item_sk FROM store_sales ss"
-        ast = sqlglot.parse_one(sql, dialect="spark")
+        ast = parse(sql)
 
         sources = extract_sources_from_select(ast)
         resolved, warnings = resolve_columns(ast, sources)
@@ -187,7 +188,7 @@ class TestColumnResolution:
     def test_qualified_column_unknown_table(self):
         """Test qualified column with unknown table reference."""
         sql = "SELECT x.col FROM store_sales ss"
-        ast = sqlglot.parse_one(sql, dialect="spark")
+        ast = parse(sql)
 
         sources = extract_sources_from_select(ast)
         resolved, warnings = resolve_columns(ast, sources)
@@ -199,7 +200,7 @@ class TestColumnResolution:
     def test_unqualified_column_with_schema(self, schema_meta):
         """Test resolving unqualified column with schema."""
         sql = "SELECT ss_item_sk FROM store_sales ss"
-        ast = sqlglot.parse_one(sql, dialect="spark")
+        ast = parse(sql)
 
         sources = extract_sources_from_select(ast)
         resolved, warnings = resolve_columns(ast, sources, schema_meta)
@@ -214,7 +215,7 @@ class TestColumnResolution:
         # Both store_sales and item might have same column name in some schema
         # For this test, we use columns that only exist in one table
         sql = "SELECT ss_item_sk, i_item_sk FROM store_sales ss JOIN item i ON ss.ss_item_sk = i.i_item_sk"
-        ast = sqlglot.parse_one(sql, dialect="spark")
+        ast = parse(sql)
 
         sources = extract_sources_from_select(ast)
         resolved, warnings = resolve_columns(ast, sources, schema_meta)
@@ -226,7 +227,7 @@ class TestColumnResolution:
     def test_unqualified_column_no_schema(self):
         """Test unqualified column without schema."""
         sql = "SELECT col FROM store_sales ss"
-        ast = sqlglot.parse_one(sql, dialect="spark")
+        ast = parse(sql)
 
         sources = extract_sources_from_select(ast)
         resolved, warnings = resolve_columns(ast, sources, schema_meta=None)
@@ -238,7 +239,7 @@ class TestColumnResolution:
     def test_columns_not_in_subquery(self):
         """Test that columns in subqueries are not resolved at parent level."""
         sql = "SELECT a FROM t WHERE x IN (SELECT inner_col FROM inner_t)"
-        ast = sqlglot.parse_one(sql, dialect="spark")
+        ast = parse(sql)
 
         sources = extract_sources_from_select(ast)
         resolved, warnings = resolve_columns(ast, sources)
@@ -254,7 +255,7 @@ class TestGetCteNames:
     def test_single_cte(self):
         """Test extracting single CTE name."""
         sql = "WITH cte1 AS (SELECT 1) SELECT * FROM cte1"
-        ast = sqlglot.parse_one(sql, dialect="spark")
+        ast = parse(sql)
 
         cte_names = get_cte_names_from_ast(ast)
 
@@ -268,7 +269,7 @@ class TestGetCteNames:
             cte2 AS (SELECT 2)
         SELECT * FROM cte1, cte2
         """
-        ast = sqlglot.parse_one(sql, dialect="spark")
+        ast = parse(sql)
 
         cte_names = get_cte_names_from_ast(ast)
 
@@ -277,7 +278,7 @@ class TestGetCteNames:
     def test_no_ctes(self):
         """Test query without CTEs."""
         sql = "SELECT * FROM t"
-        ast = sqlglot.parse_one(sql, dialect="spark")
+        ast = parse(sql)
 
         cte_names = get_cte_names_from_ast(ast)
 
@@ -291,43 +292,44 @@ class TestGetCteNames:
         UNION
         SELECT 2
         """
-        ast = sqlglot.parse_one(sql, dialect="spark")
+        ast = parse(sql)
 
         cte_names = get_cte_names_from_ast(ast)
 
         assert cte_names == {"cte"}
 
 
+@pytest.fixture(scope="class")
+def derived_pair_ast():
+    """Parse the shared two-derived-table query once per test class."""
+    sql = """
+    SELECT *
+    FROM (SELECT a FROM t1) AS d1
+    JOIN (SELECT b FROM t2) AS d2 ON d1.a = d2.b
+    """
+    return parse(sql)
+
+
 class TestDerivedTableNaming:
-    """Tests for derived table synthetic naming."""
+    """Tests for derived table synthetic naming.
 
-    def test_stable_synthetic_names(self):
-        """Test that synthetic names are stable across extractions."""
-        sql = """
-        SELECT *
-        FROM (SELECT a FROM t1) AS d1
-        JOIN (SELECT b FROM t2) AS d2 ON d1.a = d2.b
-        """
-        ast = sqlglot.parse_one(sql, dialect="spark")
+    Both tests read the same two-derived-table query; the AST is parsed
+    once per class and shared (source extraction does not mutate it).
+    """
 
-        sources1 = extract_sources_from_select(ast)
-        sources2 = extract_sources_from_select(ast)
+    def test_stable_synthetic_names(self, derived_pair_ast):
+        """Test that synthetic names are stable across extractions."""
+        sources1 = extract_sources_from_select(derived_pair_ast)
+        sources2 = extract_sources_from_select(derived_pair_ast)
 
         names1 = sorted([t.name for t in sources1.tables])
         names2 = sorted([t.name for t in sources2.tables])
 
         assert names1 == names2
 
-    def test_derived_counter_increments(self):
+    def test_derived_counter_increments(self, derived_pair_ast):
         """Test that derived counter increments for multiple subqueries."""
-        sql = """
-        SELECT *
-        FROM (SELECT a FROM t1) AS d1
-        JOIN (SELECT b FROM t2) AS d2 ON d1.a = d2.b
-        """
-        ast = sqlglot.parse_one(sql, dialect="spark")
-
-        sources = extract_sources_from_select(ast)
+        sources = extract_sources_from_select(derived_pair_ast)
         derived = [t for t in sources.tables if t.kind == "derived"]
 
         assert len(derived) == 2
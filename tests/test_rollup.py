@@ -1,11 +1,20 @@
-from sqlglot import parse_one, transpile
+"""
+Manual check for sqlglot ROLLUP round-tripping.
 
-sql = "SELECT a, b, COUNT(*) FROM t GROUP BY ROLLUP (a, b)"
+Not a pytest test: run directly with `python tests/test_rollup.py`.
+Kept out of collection via `collect_ignore` in conftest.py so the default
+run does not pay the parse + regeneration + print cost.
+"""
 
-# 解析后再输出 SQL
-print(parse_one(sql).sql())
-# 预期输出：SELECT a, b, COUNT(*) FROM t GROUP BY ROLLUP (a, b)
+if __name__ == "__main__":
+    from sqlglot import parse_one, transpile
 
-# 或者使用 transpile（可切换方言）
-print(transpile(sql)[0])
-# 预期输出同上
+    sql = "SELECT a, b, COUNT(*) FROM t GROUP BY ROLLUP (a, b)"
+
+    # 解析后再输出 SQL
+    print(parse_one(sql).sql())
+    # 预期输出：SELECT a, b, COUNT(*) FROM t GROUP BY ROLLUP (a, b)
+
+    # 或者使用 transpile（可切换方言）
+    print(transpile(sql)[0])
+    # 预期输出同上
@@ -8,15 +8,15 @@ from pathlib import Path
 from ecse_gen.schema_meta import load_schema_meta, SchemaMeta, ForeignKey
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def schema_path() -> Path:
     """Return path to test schema_meta.json."""
     return Path(__file__).parent.parent / "schema_meta.json"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def schema(schema_path: Path) -> SchemaMeta:
-    """Load and return SchemaMeta."""
+    """Load and return SchemaMeta once per session (tests are read-only)."""
     return load_schema_meta(schema_path)
 
 
@@ -61,39 +61,53 @@ class TestSchemaMetaLoading:
 class TestNotNullIndex:
     """Tests for NOT NULL index."""
 
-    def test_pk_columns_not_null(self, schema: SchemaMeta):
-        """Test that PK columns are NOT NULL."""
-        assert schema.is_not_null("store_sales", "ss_item_sk")
-        assert schema.is_not_null("store_sales", "ss_ticket_number")
-        assert schema.is_not_null("item", "i_item_sk")
-        assert schema.is_not_null("date_dim", "d_date_sk")
-
-    def test_nullable_columns(self, schema: SchemaMeta):
-        """Test that nullable columns are correctly identified."""
-        assert not schema.is_not_null("store_sales", "ss_sold_date_sk")
-        assert not schema.is_not_null("store_sales", "ss_customer_sk")
-        assert not schema.is_not_null("item", "i_product_name")
-
-    def test_unknown_table(self, schema: SchemaMeta):
-        """Test behavior for unknown table."""
-        assert not schema.is_not_null("unknown_table", "some_col")
+    @pytest.mark.parametrize(
+        "table,column,expected",
+        [
+            # PK columns are NOT NULL
+            ("store_sales", "ss_item_sk", True),
+            ("store_sales", "ss_ticket_number", True),
+            ("item", "i_item_sk", True),
+            ("date_dim", "d_date_sk", True),
+            # Nullable columns
+            ("store_sales", "ss_sold_date_sk", False),
+            ("store_sales", "ss_customer_sk", False),
+            ("item", "i_product_name", False),
+            # Unknown table
+            ("unknown_table", "some_col", False),
+        ],
+    )
+    def test_is_not_null(self, schema: SchemaMeta, table, column, expected):
+        """Test NOT NULL classification per (table, column)."""
+        assert schema.is_not_null(table, column) is expected
 
 
 class TestFKPairLookup:
     """Tests for FK pair lookup."""
 
-    def test_enforced_fk(self, schema: SchemaMeta):
-        """Test lookup of enforced FK."""
-        assert schema.find_fk_pair("store_sales", "ss_item_sk", "item", "i_item_sk")
-        assert schema.find_fk_pair("store_sales", "ss_sold_date_sk", "date_dim", "d_date_sk")
-        assert schema.find_fk_pair("store_sales", "ss_customer_sk", "customer", "c_customer_sk")
-
-    def test_recommended_fk(self, schema: SchemaMeta):
-        """Test lookup of recommended (non-enforced) FK."""
-        # These are recommended FKs with enforced=false
-        assert schema.find_fk_pair("customer", "c_current_cdemo_sk", "customer_demographics", "cd_demo_sk")
-        assert schema.find_fk_pair("customer", "c_current_hdemo_sk", "household_demographics", "hd_demo_sk")
-        assert schema.find_fk_pair("customer", "c_current_addr_sk", "customer_address", "ca_address_sk")
+    @pytest.mark.parametrize(
+        "from_table,from_col,to_table,to_col,expected",
+        [
+            # Enforced FKs
+            ("store_sales", "ss_item_sk", "item", "i_item_sk", True),
+            ("store_sales", "ss_sold_date_sk", "date_dim", "d_date_sk", True),
+            ("store_sales", "ss_customer_sk", "customer", "c_customer_sk", True),
+            # Recommended FKs with enforced=false
+            ("customer", "c_current_cdemo_sk", "customer_demographics", "cd_demo_sk", True),
+            ("customer", "c_current_hdemo_sk", "household_demographics", "hd_demo_sk", True),
+            ("customer", "c_current_addr_sk", "customer_address", "ca_address_sk", True),
+            # Non-existent pairs
+            ("store_sales", "ss_quantity", "item", "i_item_sk", False),
+            ("unknown", "col", "table", "col", False),
+        ],
+    )
+    def test_find_fk_pair(
+        self, schema: SchemaMeta, from_table, from_col, to_table, to_col, expected
+    ):
+        """Test FK pair lookup across enforced/recommended/missing cases."""
+        assert bool(
+            schema.find_fk_pair(from_table, from_col, to_table, to_col)
+        ) is expected
 
     def test_recommended_fk_properties(self, schema: SchemaMeta):
         """Test that recommended FKs have correct properties."""
@@ -102,11 +116,6 @@ class TestFKPairLookup:
         assert fk.enforced is False
         assert fk.recommended is True
 
-    def test_nonexistent_fk(self, schema: SchemaMeta):
-        """Test lookup of non-existent FK."""
-        assert not schema.find_fk_pair("store_sales", "ss_quantity", "item", "i_item_sk")
-        assert not schema.find_fk_pair("unknown", "col", "table", "col")
-
 
 class TestFKCompositeLookup:
     """Tests for composite FK lookup."""
@@ -173,18 +182,30 @@ class TestFKFromTable:
 class TestHasTableColumn:
     """Tests for table/column existence checks."""
 
-    def test_has_table(self, schema: SchemaMeta):
+    @pytest.mark.parametrize(
+        "table,expected",
+        [
+            ("store_sales", True),
+            ("item", True),
+            ("nonexistent_table", False),
+        ],
+    )
+    def test_has_table(self, schema: SchemaMeta, table, expected):
         """Test has_table method."""
-        assert schema.has_table("store_sales")
-        assert schema.has_table("item")
-        assert not schema.has_table("nonexistent_table")
-
-    def test_has_column(self, schema: SchemaMeta):
+        assert schema.has_table(table) is expected
+
+    @pytest.mark.parametrize(
+        "table,column,expected",
+        [
+            ("store_sales", "ss_item_sk", True),
+            ("item", "i_product_name", True),
+            ("store_sales", "nonexistent_col", False),
+            ("nonexistent_table", "col", False),
+        ],
+    )
+    def test_has_column(self, schema: SchemaMeta, table, column, expected):
         """Test has_column method."""
-        assert schema.has_column("store_sales", "ss_item_sk")
-        assert schema.has_column("item", "i_product_name")
-        assert not schema.has_column("store_sales", "nonexistent_col")
-        assert not schema.has_column("nonexistent_table", "col")
+        assert schema.has_column(table, column) is expected
 
 
 if __name__ == "__main__":
@@ -10,10 +10,46 @@ from ecse_gen.util_ast_dump import (
     dump_joins,
     dump_ctes,
     dump_unions,
+    dump_all,
     summarize_query,
 )
 
-import sqlglot
+from tests._sql_cache import parse
+
+from types import SimpleNamespace
+
+# Queries whose dump output is asserted by several tests; each is parsed,
+# walked, and stringified once per module via the ast_bundle fixture.
+_MULTI_JOIN_SQL = """SELECT * FROM t1
+   JOIN t2 ON t1.id = t2.id
+   LEFT JOIN t3 ON t2.id = t3.id"""
+_MULTI_CTE_SQL = """WITH
+   cte1 AS (SELECT 1),
+   cte2 AS (SELECT 2)
+   SELECT * FROM cte1, cte2"""
+_TRIPLE_UNION_SQL = "SELECT 1 UNION SELECT 2 UNION SELECT 3"
+
+
+@pytest.fixture(scope="module")
+def parsed_ast(request):
+    """Indirect fixture: parse the requested SQL via the shared cache."""
+    return parse(request.param)
+
+
+@pytest.fixture(scope="module")
+def ast_bundle():
+    """Precompute dump outputs keyed by SQL text for the shared queries."""
+    bundles = {}
+    for sql in (_MULTI_JOIN_SQL, _MULTI_CTE_SQL, _TRIPLE_UNION_SQL):
+        ast = parse(sql)
+        bundles[sql] = SimpleNamespace(
+            ast=ast,
+            joins=dump_joins(ast),
+            ctes=dump_ctes(ast),
+            unions=dump_unions(ast),
+            summary=summarize_query(sql),
+        )
+    return bundles
 
 
 class TestDumpAst:
@@ -21,7 +57,7 @@ class TestDumpAst:
 
     def test_dump_simple_select(self):
         """Test dumping simple SELECT."""
-        ast = sqlglot.parse_one("SELECT a, b FROM t", dialect="spark")
+        ast = parse("SELECT a, b FROM t")
         result = dump_ast(ast)
         assert "Select" in result
         assert "Column" in result
@@ -29,20 +65,19 @@ class TestDumpAst:
 
     def test_dump_with_join(self):
         """Test dumping query with JOIN."""
-        ast = sqlglot.parse_one(
-            "SELECT * FROM t1 JOIN t2 ON t1.id = t2.id",
-            dialect="spark"
+        ast = parse(
+            "SELECT * FROM t1 JOIN t2 ON t1.id = t2.id"
         )
         result = dump_ast(ast)
         assert "Join" in result
 
     def test_dump_max_depth(self):
         """Test depth limiting."""
-        ast = sqlglot.parse_one("SELECT a FROM t WHERE x = 1", dialect="spark")
+        ast = parse("SELECT a FROM t WHERE x = 1")
         result_shallow = dump_ast(ast, max_depth=1)
         result_deep = dump_ast(ast, max_depth=10)
-        # Shallow should have fewer lines
-        assert len(result_shallow.split('\n')) < len(result_deep.split('\n'))
+        # Shallow should have fewer lines (count avoids splitting into lists)
+        assert result_shallow.count('\n') < result_deep.count('\n')
 
 
 class TestDumpSql:
@@ -58,45 +93,28 @@ class TestDumpSql:
 class TestDumpJoins:
     """Tests for JOIN dumping."""
 
-    def test_dump_inner_join(self):
-        """Test dumping INNER JOIN."""
-        ast = sqlglot.parse_one(
-            "SELECT * FROM t1 JOIN t2 ON t1.id = t2.id",
-            dialect="spark"
-        )
-        result = dump_joins(ast)
-        assert "INNER" in result.upper() or "JOIN" in result.upper()
+    @pytest.mark.parametrize(
+        "parsed_ast,expected",
+        [
+            ("SELECT * FROM t1 JOIN t2 ON t1.id = t2.id", "JOIN"),
+            ("SELECT * FROM t1 LEFT JOIN t2 ON t1.id = t2.id", "LEFT"),
+            ("SELECT * FROM t1 JOIN t2 USING (id)", "USING"),
+        ],
+        indirect=["parsed_ast"],
+        ids=["inner", "left", "using"],
+    )
+    def test_dump_join_kind(self, parsed_ast, expected):
+        """Test join-kind markers in the dump; each SQL is parsed once."""
+        result = dump_joins(parsed_ast)
+        assert expected in result.upper()
         assert "t2" in result
 
-    def test_dump_left_join(self):
-        """Test dumping LEFT JOIN."""
-        ast = sqlglot.parse_one(
-            "SELECT * FROM t1 LEFT JOIN t2 ON t1.id = t2.id",
-            dialect="spark"
-        )
-        result = dump_joins(ast)
-        assert "LEFT" in result.upper()
-
-    def test_dump_multiple_joins(self):
+    def test_dump_multiple_joins(self, ast_bundle):
         """Test dumping multiple JOINs."""
-        ast = sqlglot.parse_one(
-            """SELECT * FROM t1
-               JOIN t2 ON t1.id = t2.id
-               LEFT JOIN t3 ON t2.id = t3.id""",
-            dialect="spark"
-        )
-        result = dump_joins(ast)
-        lines = result.strip().split('\n')
-        assert len(lines) == 2
-
-    def test_dump_join_using(self):
-        """Test dumping JOIN USING."""
-        ast = sqlglot.parse_one(
-            "SELECT * FROM t1 JOIN t2 USING (id)",
-            dialect="spark"
-        )
-        result = dump_joins(ast)
-        assert "USING" in result.upper()
+        result = ast_bundle[_MULTI_JOIN_SQL].joins
+        # Two join lines -> exactly one separating newline
+        assert result.strip().count('\n') == 1
+
 
 
 class TestDumpCtes:
@@ -104,30 +122,22 @@ class TestDumpCtes:
 
     def test_dump_single_cte(self):
         """Test dumping single CTE."""
-        ast = sqlglot.parse_one(
-            "WITH cte AS (SELECT 1 AS x) SELECT * FROM cte",
-            dialect="spark"
+        ast = parse(
+            "WITH cte AS (SELECT 1 AS x) SELECT * FROM cte"
         )
         result = dump_ctes(ast)
         assert "cte" in result.lower()
         assert "CTE[0]" in result
 
-    def test_dump_multiple_ctes(self):
+    def test_dump_multiple_ctes(self, ast_bundle):
         """Test dumping multiple CTEs."""
-        ast = sqlglot.parse_one(
-            """WITH
-               cte1 AS (SELECT 1),
-               cte2 AS (SELECT 2)
-               SELECT * FROM cte1, cte2""",
-            dialect="spark"
-        )
-        result = dump_ctes(ast)
+        result = ast_bundle[_MULTI_CTE_SQL].ctes
         assert "cte1" in result.lower()
         assert "cte2" in result.lower()
 
     def test_no_ctes(self):
         """Test query without CTEs."""
-        ast = sqlglot.parse_one("SELECT * FROM t", dialect="spark")
+        ast = parse("SELECT * FROM t")
         result = dump_ctes(ast)
         assert "No CTEs" in result
 
@@ -137,9 +147,8 @@ class TestDumpUnions:
 
     def test_dump_union(self):
         """Test dumping UNION."""
-        ast = sqlglot.parse_one(
-            "SELECT 1 UNION SELECT 2",
-            dialect="spark"
+        ast = parse(
+            "SELECT 1 UNION SELECT 2"
         )
         result = dump_unions(ast)
         assert "UNION" in result
@@ -148,20 +157,15 @@ class TestDumpUnions:
 
     def test_dump_union_all(self):
         """Test dumping UNION ALL."""
-        ast = sqlglot.parse_one(
-            "SELECT 1 UNION ALL SELECT 2",
-            dialect="spark"
+        ast = parse(
+            "SELECT 1 UNION ALL SELECT 2"
         )
         result = dump_unions(ast)
         assert "UNION ALL" in result
 
-    def test_dump_triple_union(self):
+    def test_dump_triple_union(self, ast_bundle):
         """Test dumping three-way UNION."""
-        ast = sqlglot.parse_one(
-            "SELECT 1 UNION SELECT 2 UNION SELECT 3",
-            dialect="spark"
-        )
-        result = dump_unions(ast)
+        result = ast_bundle[_TRIPLE_UNION_SQL].unions
         # Should have 3 branches
         assert "Branch[1]" in result
         assert "Branch[2]" in result
@@ -169,12 +173,38 @@ class TestDumpUnions:
 
     def test_no_union(self):
         """Test query without UNION."""
-        ast = sqlglot.parse_one("SELECT * FROM t", dialect="spark")
+        ast = parse("SELECT * FROM t")
         result = dump_unions(ast)
         # Just a single branch
         assert "Branch[1]" in result
 
 
+class TestDumpAll:
+    """Tests for the combined dump."""
+
+    def test_dump_all_matches_individual_dumps(self):
+        """Test that dump_all agrees with the per-view dump functions."""
+        ast = parse(
+            """WITH cte AS (SELECT 1 AS x)
+               SELECT * FROM t1 JOIN t2 ON t1.id = t2.id
+               UNION
+               SELECT * FROM cte"""
+        )
+        result = dump_all(ast)
+
+        assert result["joins"] == dump_joins(ast)
+        assert result["ctes"] == dump_ctes(ast)
+        assert result["unions"] == dump_unions(ast)
+
+    def test_dump_all_plain_select(self):
+        """Test dump_all on a query with none of the three constructs."""
+        result = dump_all(parse("SELECT * FROM t"))
+
+        assert result["joins"] == ""
+        assert result["ctes"] == "No CTEs found"
+        assert "Branch[1]" in result["unions"]
+
+
 class TestSummarizeQuery:
     """Tests for query summarization."""
 
@@ -14,6 +14,7 @@ from ecse_gen.workload_reader import (
     clean_sql,
     extract_first_query,
     load_workload_query,
+    load_workload_query_from_text,
     scan_workload_dir,
 )
 
@@ -166,28 +167,27 @@ class TestExtractFirstQuery:
 
 
 class TestLoadWorkloadQuery:
-    """Tests for loading workload queries."""
+    """Tests for loading workload queries.
 
-    def test_load_simple_query(self, tmp_path):
-        """Test loading a simple query file."""
-        sql_file = tmp_path / "test.sql"
-        sql_file.write_text("SELECT * FROM t;")
+    Most cases feed SQL text directly via load_workload_query_from_text;
+    only the BOM case still goes through the filesystem, as an integration
+    check of the read + decode path.
+    """
 
-        query = load_workload_query(sql_file)
+    def test_load_simple_query(self):
+        """Test loading a simple query."""
+        query = load_workload_query_from_text("SELECT * FROM t;", "test.sql")
         assert query.source_sql_file == "test.sql"
         assert query.is_valid()
         assert "SELECT" in query.cleaned_sql
 
-    def test_load_query_with_comments(self, tmp_path):
+    def test_load_query_with_comments(self):
         """Test loading query with comments."""
-        sql_file = tmp_path / "test.sql"
-        sql_file.write_text("""
+        query = load_workload_query_from_text("""
 -- This is a comment
 SELECT * FROM t -- inline
 WHERE x = 1;
-""")
-
-        query = load_workload_query(sql_file)
+""", "test.sql")
         assert query.is_valid()
         assert "--" not in query.cleaned_sql
 
@@ -201,12 +201,9 @@ WHERE x = 1;
         assert query.is_valid()
         assert query.cleaned_sql.startswith("SELECT")
 
-    def test_load_empty_file(self, tmp_path):
-        """Test loading empty file."""
-        sql_file = tmp_path / "empty.sql"
-        sql_file.write_text("")
-
-        query = load_workload_query(sql_file)
+    def test_load_empty_query(self):
+        """Test loading empty content."""
+        query = load_workload_query_from_text("", "empty.sql")
         assert not query.is_valid()
         assert len(query.warnings) > 0
 
@@ -234,6 +231,22 @@ class TestScanWorkloadDir:
         files = scan_workload_dir(tmp_path, recursive=True)
         assert len(files) == 2
 
+    def test_scan_follows_symlinks(self, tmp_path):
+        """Test that symlinked .sql files and directories are scanned."""
+        target_dir = tmp_path / "target"
+        target_dir.mkdir()
+        (target_dir / "q1.sql").write_text("SELECT 1")
+
+        workload = tmp_path / "workload"
+        workload.mkdir()
+        (workload / "link.sql").symlink_to(target_dir / "q1.sql")
+        (workload / "linked_dir").symlink_to(target_dir, target_is_directory=True)
+
+        files = scan_workload_dir(workload, recursive=True)
+        names = [f.name for f in files]
+        assert "link.sql" in names
+        assert "q1.sql" in names
+
     def test_scan_sorted(self, tmp_path):
         """Test that files are sorted."""
         (tmp_path / "z.sql").write_text("SELECT 1")